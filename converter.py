@@ -6,12 +6,239 @@ This script reads Obsidian markdown files from the input directory specified in
 and converts them to HTML files in the output directory, preserving the directory structure.
 """
 
+import errno
+import json
 import os
-import yaml
 import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Dict, Iterator, List, Set, Tuple
 from utils.convert_markdown import MarkdownConverter
 
+__all__ = ['ObsidianConverter', 'MarkdownConverter']
+
+
+# Per-process markdown converter, created lazily inside each worker
+_markdown_converter = None
+
+# Output directories already created by the current process
+_created_dirs: Set[Path] = set()
+
+# Fast copy methods that failed in a way that will not change for this
+# output location (e.g. cross-device link), so they are not retried
+_unsupported_copy_methods: Set[str] = set()
+
+# Errors meaning a copy method cannot work between these filesystems at all.
+# EPERM is deliberately absent: it is per file (e.g. fs.protected_hardlinks
+# refusing to link a file owned by another user), so it only skips that file
+_UNSUPPORTED_COPY_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.ENOTSUP, errno.EOPNOTSUPP}
+
+# (input_file, input_path, output_path) handed to the worker processes
+ConversionJob = Tuple[Path, Path, Path]
+
+# Incremental build cache in the output directory, mapping each input file's
+# relative path to the [mtime_ns, size] it had when it was last converted
+CACHE_FILE_NAME = '.obsblog-cache.json'
+
+# Version of the generated output; bump whenever rendering, the HTML template
+# or Obsidian feature handling changes so cached outputs get rebuilt
+CACHE_VERSION = 1
+
+
+def _get_markdown_converter() -> MarkdownConverter:
+    """Return the markdown converter for the current process."""
+    global _markdown_converter
+    if _markdown_converter is None:
+        _markdown_converter = MarkdownConverter()
+    return _markdown_converter
+
+
+def _get_relative_path(file_path: Path, input_path: Path) -> Path:
+    """Get the relative path from input directory."""
+    try:
+        return file_path.relative_to(input_path)
+    except ValueError:
+        return file_path
+
+
+def _is_markdown(name: str) -> bool:
+    """Return True for markdown files; a dotfile such as '.md' has no suffix."""
+    return os.path.splitext(name)[1].lower() == '.md'
+
+
+def _get_output_relative(relative: str) -> str:
+    """Map a path relative to the input directory to its output path; markdown files become .html."""
+    if _is_markdown(relative):
+        return os.path.splitext(relative)[0] + '.html'
+    return relative
+
+
+def _get_output_file(input_file: Path, input_path: Path, output_path: Path) -> Path:
+    """Get the output path for an input file; markdown files become .html."""
+    relative_path = _get_relative_path(input_file, input_path)
+    return output_path / _get_output_relative(str(relative_path))
+
+
+def _iter_files(root: str) -> Iterator[os.DirEntry]:
+    """
+    Recursively yield directory entries for all files below root.
+    
+    Like os.walk, unreadable directories are skipped instead of aborting.
+    """
+    try:
+        entries = os.scandir(root)
+    except OSError as e:
+        print(f"Skipping unreadable directory {root}: {e}")
+        return
+    
+    with entries:
+        while True:
+            try:
+                entry = next(entries)
+            except StopIteration:
+                break
+            except OSError as e:
+                print(f"Skipping unreadable directory {root}: {e}")
+                break
+            
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                is_file = not is_dir and entry.is_file()
+            except OSError:
+                continue
+            
+            if is_dir:
+                yield from _iter_files(entry.path)
+            elif is_file:
+                yield entry
+
+
+def _ensure_dir(directory: Path) -> None:
+    """Create a directory once, skipping directories this process already made."""
+    if directory in _created_dirs:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    _created_dirs.add(directory)
+
+
+def _write_html(output_file: Path, html_content: str, title: str) -> None:
+    """Write an HTML document, gathering its parts into one write where possible."""
+    parts = _get_markdown_converter().create_html_document_parts(html_content, title)
+    buffers = [part.encode('utf-8') for part in parts]
+    total = sum(len(buffer) for buffer in buffers)
+    
+    # Never write through an existing output, it may be a hardlink into the
+    # vault (e.g. a vault file that was copied to this path on an earlier run)
+    if os.path.lexists(output_file):
+        output_file.unlink()
+    
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    fd = os.open(str(output_file), flags, 0o644)
+    try:
+        written = os.writev(fd, buffers) if hasattr(os, 'writev') else 0
+        
+        # Fall back to plain writes without writev or after a short write
+        if written < total:
+            remaining = memoryview(b''.join(buffers))[written:]
+            while remaining:
+                remaining = remaining[os.write(fd, remaining):]
+    finally:
+        os.close(fd)
+
+
+def _copy_file_range(input_file: Path, output_file: Path) -> None:
+    """Copy a file with copy_file_range, letting the kernel (or a reflink) do the work."""
+    src = os.open(str(input_file), os.O_RDONLY)
+    try:
+        dst = os.open(str(output_file), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            remaining = os.fstat(src).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(src, dst, remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        finally:
+            os.close(dst)
+    finally:
+        os.close(src)
+
+
+def _copy_file(input_file: Path, output_file: Path) -> None:
+    """Copy a file, preferring a hardlink, then an in-kernel copy, then shutil.copy2."""
+    # Never write through an existing output, it may be a hardlink to the input
+    if os.path.lexists(output_file):
+        output_file.unlink()
+    
+    if 'link' not in _unsupported_copy_methods:
+        try:
+            os.link(input_file, output_file)
+            return
+        except OSError as e:
+            if e.errno in _UNSUPPORTED_COPY_ERRNOS:
+                _unsupported_copy_methods.add('link')
+    
+    if hasattr(os, 'copy_file_range') and 'copy_file_range' not in _unsupported_copy_methods:
+        try:
+            _copy_file_range(input_file, output_file)
+            shutil.copystat(input_file, output_file)
+            return
+        except OSError as e:
+            if e.errno in _UNSUPPORTED_COPY_ERRNOS or e.errno == errno.EINVAL:
+                _unsupported_copy_methods.add('copy_file_range')
+    
+    shutil.copy2(input_file, output_file)
+
+
+def convert_file(job: ConversionJob) -> bool:
+    """Convert a single markdown file to HTML. Returns True on success."""
+    input_file, input_path, output_path = job
+    try:
+        markdown_converter = _get_markdown_converter()
+        
+        # Read the markdown content
+        content = input_file.read_text(encoding='utf-8')
+        
+        # Convert to HTML using the markdown converter
+        html_content = markdown_converter.convert_obsidian_to_html(content)
+        
+        # Create output file path
+        output_file = _get_output_file(input_file, input_path, output_path)
+        
+        # Ensure output directory exists
+        _ensure_dir(output_file.parent)
+        
+        # Write HTML document with title
+        title = input_file.stem
+        _write_html(output_file, html_content, title)
+        
+        print(f"Converted: {input_file} -> {output_file}")
+        return True
+        
+    except Exception as e:
+        print(f"Error converting {input_file}: {e}")
+        return False
+
+
+def copy_non_markdown_file(job: ConversionJob) -> bool:
+    """Copy non-markdown files as-is to the output directory. Returns True on success."""
+    input_file, input_path, output_path = job
+    try:
+        output_file = _get_output_file(input_file, input_path, output_path)
+        
+        # Ensure output directory exists
+        _ensure_dir(output_file.parent)
+        
+        # Copy the file
+        _copy_file(input_file, output_file)
+        print(f"Copied: {input_file} -> {output_file}")
+        return True
+        
+    except Exception as e:
+        print(f"Error copying {input_file}: {e}")
+        return False
+
 
 class ObsidianConverter:
     def __init__(self, config_file: str = "obs-blog.yaml"):
@@ -19,12 +246,12 @@ class ObsidianConverter:
         self.config = self._load_config(config_file)
         self.input_path = Path(self.config['input']).expanduser()
         self.output_path = Path(self.config['output'])
-        
-        # Initialize markdown converter
-        self.markdown_converter = MarkdownConverter()
+        self.cache_file = self.output_path / CACHE_FILE_NAME
     
     def _load_config(self, config_file: str) -> dict:
         """Load configuration from YAML file."""
+        import yaml
+        
         try:
             with open(config_file, 'r') as f:
                 return yaml.safe_load(f)
@@ -33,58 +260,27 @@ class ObsidianConverter:
         except yaml.YAMLError as e:
             raise ValueError(f"Error parsing YAML configuration: {e}")
     
-    def _get_relative_path(self, file_path: Path) -> Path:
-        """Get the relative path from input directory."""
+    def _load_cache(self) -> Dict[str, List[int]]:
+        """
+        Load the incremental build cache, or start empty if it is missing,
+        unreadable or was written for a different output version.
+        """
         try:
-            return file_path.relative_to(self.input_path)
-        except ValueError:
-            return file_path
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict) or cache.get('version') != CACHE_VERSION:
+            return {}
+        files = cache.get('files')
+        return files if isinstance(files, dict) else {}
     
-    def convert_file(self, input_file: Path) -> None:
-        """Convert a single markdown file to HTML."""
-        try:
-            # Read the markdown content
-            with open(input_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Convert to HTML using the markdown converter
-            html_content = self.markdown_converter.convert_obsidian_to_html(content)
-            
-            # Create output file path
-            relative_path = self._get_relative_path(input_file)
-            output_file = self.output_path / relative_path.with_suffix('.html')
-            
-            # Ensure output directory exists
-            output_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Create HTML document with title
-            title = input_file.stem
-            full_html = self.markdown_converter.create_html_document(html_content, title)
-            
-            # Write HTML file
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(full_html)
-            
-            print(f"Converted: {input_file} -> {output_file}")
-            
-        except Exception as e:
-            print(f"Error converting {input_file}: {e}")
-    
-    def copy_non_markdown_file(self, input_file: Path) -> None:
-        """Copy non-markdown files as-is to the output directory."""
-        try:
-            relative_path = self._get_relative_path(input_file)
-            output_file = self.output_path / relative_path
-            
-            # Ensure output directory exists
-            output_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Copy the file
-            shutil.copy2(input_file, output_file)
-            print(f"Copied: {input_file} -> {output_file}")
-            
-        except Exception as e:
-            print(f"Error copying {input_file}: {e}")
+    def _save_cache(self, cache: Dict[str, List[int]]) -> None:
+        """Write the incremental build cache atomically."""
+        tmp_file = self.cache_file.with_name(self.cache_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'files': cache}, f)
+        os.replace(tmp_file, self.cache_file)
     
     def convert_directory(self) -> None:
         """Convert all files in the input directory."""
@@ -94,20 +290,71 @@ class ObsidianConverter:
         # Create output directory if it doesn't exist
         self.output_path.mkdir(parents=True, exist_ok=True)
         
-        # Walk through all files in the input directory
-        for root, dirs, files in os.walk(self.input_path):
-            root_path = Path(root)
+        # Only entries for files that still exist are carried over
+        cache = self._load_cache()
+        new_cache = {}
+        skipped = 0
+        
+        # Collect all files first so they can be fanned out to the workers;
+        # paths stay plain strings until a file actually needs work
+        input_root = str(self.input_path)
+        output_root = str(self.output_path)
+        prefix_len = len(os.path.join(input_root, ''))
+        found = []
+        for dir_entry in _iter_files(input_root):
+            relative = dir_entry.path[prefix_len:]
+            found.append((dir_entry, relative, _is_markdown(dir_entry.name)))
+        
+        # Only one input may produce each output (e.g. 'foo.md' and 'foo.html'
+        # both map to 'foo.html'); markdown files win, the others are skipped
+        claimed = {CACHE_FILE_NAME: 'the build cache'}
+        md_files = []
+        other_files = []
+        for dir_entry, relative, is_markdown in sorted(found, key=lambda item: not item[2]):
+            output_relative = _get_output_relative(relative)
+            if output_relative in claimed:
+                print(f"Skipping {dir_entry.path}: {output_relative} is already "
+                      f"produced from {claimed[output_relative]}")
+                continue
+            claimed[output_relative] = dir_entry.path
+            
+            # Skip files unchanged since the last run whose output still exists
+            key = relative.replace(os.sep, '/')
+            try:
+                stat = dir_entry.stat()
+            except OSError as e:
+                # e.g. the file was removed while walking
+                print(f"Skipping {dir_entry.path}: {e}")
+                continue
+            signature = [stat.st_mtime_ns, stat.st_size]
+            if cache.get(key) == signature:
+                if os.path.exists(os.path.join(output_root, output_relative)):
+                    new_cache[key] = signature
+                    skipped += 1
+                    continue
             
-            for file in files:
-                file_path = root_path / file
-                
-                # Convert markdown files
-                if file_path.suffix.lower() == '.md':
-                    self.convert_file(file_path)
-                else:
-                    # Copy non-markdown files as-is
-                    self.copy_non_markdown_file(file_path)
+            entry = ((Path(dir_entry.path), self.input_path, self.output_path), key, signature)
+            if is_markdown:
+                md_files.append(entry)
+            else:
+                other_files.append(entry)
+        
+        # Forked workers would re-flush anything still buffered (e.g. skip warnings)
+        sys.stdout.flush()
+        
+        # Files are independent and conversion is CPU-bound, so use processes
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for worker, entries in ((convert_file, md_files), (copy_non_markdown_file, other_files)):
+                jobs = [job for job, key, signature in entries]
+                results = executor.map(worker, jobs, chunksize=8)
+                for (job, key, signature), ok in zip(entries, results):
+                    if ok:
+                        new_cache[key] = signature
+        
+        self._save_cache(new_cache)
         
+        if skipped:
+            print(f"Skipped {skipped} unchanged files")
         print(f"\nConversion complete! Output directory: {self.output_path}")
 
 
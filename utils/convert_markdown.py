@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Markdown conversion utilities for Obsidian to HTML conversion.
+
+This module handles the conversion of Obsidian-specific markdown features
+to HTML, including callouts, internal links, tags, and frontmatter removal.
+"""
+
+import functools
+import html
+import re
+import sys
+import unicodedata
+from typing import List, Optional
+
+
+# Obsidian syntax patterns, compiled once at import time
+_RE_FRONTMATTER = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+if sys.version_info >= (3, 11):
+    # Possessive quantifiers and atomic groups stop the engine from
+    # backtracking into link text on malformed input
+    _RE_WIKILINK = re.compile(r'\[\[(?>([^\]|]++)(?:\|([^\]]++))?)\]\]')
+    _RE_MDLINK = re.compile(r'\[([^\]]++)\]\([^)]++\)')
+else:
+    _RE_WIKILINK = re.compile(r'\[\[([^\]|]+)(?:\|([^\]]+))?\]\]')
+    _RE_MDLINK = re.compile(r'\[([^\]]+)\]\([^)]+\)')
+_RE_CALLOUT = re.compile(r'>\s*\[!(\w+)\]\s*(.*?)\n((?:>.*?\n)*)', re.MULTILINE | re.DOTALL)
+
+# Line break that is followed by a blank line
+_RE_BLANK_LINE_BREAK = re.compile(r'\n(?=[ \t]*\n)')
+
+# Anything in a callout body that needs the real parser: blank lines, block
+# markers at line start, indentation, whitespace other than ' ' and '\n'
+# (the parser strips some Unicode whitespace), HTML/entities, links and
+# other markup
+_RE_COMPLEX_CALLOUT_BODY = re.compile(
+    r'\n[ \t]*\n|^[ \t]*[-*+>\d]| {4}|[^\S \n]|[<>&\[\]!\\~|_#=]|``', re.MULTILINE)
+
+# Inline markup handled without the parser; emphasis delimiters must hug
+# alphanumerics so they are always left/right-flanking
+_RE_INLINE_CODE = re.compile(r'`([^`\n]+)`')
+_RE_STRONG = re.compile(r'(?<!\*)\*\*([^\W_](?:[^*]*[^\W_])?)\*\*(?!\*)')
+_RE_EMPHASIS = re.compile(r'(?<!\*)\*([^\W_](?:[^*]*[^\W_])?)\*(?!\*)')
+
+_MARKDOWN_PLUGINS = ['table', 'strikethrough', 'footnotes']
+
+# Anything code highlighting (fenced/indented code) or heading ids could act
+# on; a match sends the document through the full parser
+_RE_NEEDS_FULL_MARKDOWN = re.compile(
+    r'```|~~~| {4}|\t|#|^[ \t>]*[=-]+[ \t]*$', re.MULTILINE)
+
+# Constant parts of the HTML document wrapper
+_HTML_HEAD_PRE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>"""
+_HTML_HEAD_POST = """</title>
+</head>
+<body>
+"""
+_HTML_TAIL = """
+</body>
+</html>"""
+
+
+def _is_word_char(char: str) -> bool:
+    """Return True if char is a regex word character (\\w)."""
+    return char.isalnum() or char == '_'
+
+
+def _emit(out: list, text: str, contiguous: bool = False) -> None:
+    """
+    Append text to the output buffer.
+    
+    A '#' left at the end of the buffer by a previous region (e.g. right
+    before a link) becomes a tag once the next region starts with a word
+    character, so it is dropped here. Slices that merely continue after a
+    stripped tag are contiguous and skip that check.
+    """
+    if not text:
+        return
+    if not contiguous and out and out[-1][-1] == '#' and _is_word_char(text[0]):
+        tail = out[-1]
+        if len(tail) > 1:
+            prev = tail[-2]
+        else:
+            prev = out[-2][-1] if len(out) > 1 else ''
+        if not _is_word_char(prev):
+            if len(tail) > 1:
+                out[-1] = tail[:-1]
+            else:
+                out.pop()
+    out.append(text)
+
+
+def _render_simple_callout_body(text: str) -> Optional[str]:
+    """
+    Render a single-paragraph callout body without the markdown parser.
+    
+    Args:
+        text: Callout body with the '> ' prefixes removed
+        
+    Returns:
+        The paragraph HTML, or None if the body needs the full parser
+    """
+    if not text.strip(' \n') or _RE_COMPLEX_CALLOUT_BODY.search(text):
+        return None
+    
+    # Like the parser: strip spaces from each line and turn line breaks into <br />
+    text = '<br />\n'.join(line.strip(' ') for line in text.strip(' \n').split('\n'))
+    
+    # Code spans are split out so emphasis is only looked for between them
+    parts = _RE_INLINE_CODE.split(text)
+    for i, part in enumerate(parts):
+        if i % 2:
+            # One space is stripped from each side of padded code spans
+            if part[0] == ' ' and part[-1] == ' ' and part.strip(' '):
+                part = part[1:-1]
+            parts[i] = f'<code>{part}</code>'
+            continue
+        part = _RE_STRONG.sub(r'<strong>\1</strong>', part)
+        part = _RE_EMPHASIS.sub(r'<em>\1</em>', part)
+        if '*' in part or '`' in part:
+            return None
+        parts[i] = part
+    
+    return '<p>' + ''.join(parts).replace('"', '&quot;') + '</p>\n'
+
+
+def _slugify(value: str) -> str:
+    """Turn heading text into an ASCII id, e.g. 'Über uns' -> 'uber-uns'."""
+    value = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore').decode('ascii')
+    value = re.sub(r'[^\w\s-]', '', value).strip().lower()
+    return re.sub(r'[-\s]+', '-', value)
+
+
+def _create_markdown(full: bool = True):
+    """
+    Build a mistune parser.
+    
+    Args:
+        full: Add Pygments code highlighting and heading ids
+        
+    Returns:
+        Callable rendering markdown text to HTML
+    """
+    # Imported here so the mistune/pygments import cost is only paid
+    # once a document is actually converted
+    import mistune
+    
+    if not full:
+        return mistune.create_markdown(escape=False, hard_wrap=True, plugins=_MARKDOWN_PLUGINS)
+    
+    from mistune.toc import add_toc_hook
+    from pygments import highlight
+    from pygments.formatters import HtmlFormatter
+    from pygments.lexers import get_lexer_by_name, guess_lexer
+    from pygments.util import ClassNotFound
+    
+    formatter = HtmlFormatter(cssclass='codehilite', wrapcode=True)
+    
+    class HighlightRenderer(mistune.HTMLRenderer):
+        """HTML renderer that highlights code blocks with Pygments."""
+        
+        def block_code(self, code: str, info: Optional[str] = None) -> str:
+            language = info.split(None, 1)[0] if info and info.strip() else None
+            try:
+                lexer = get_lexer_by_name(language) if language else guess_lexer(code)
+            except ClassNotFound:
+                lexer = get_lexer_by_name('text')
+            return highlight(code, lexer, formatter)
+    
+    used_ids = set()
+    
+    def heading_id(token: dict, index: int) -> str:
+        # The hook numbers headings per document, so index 0 starts a new one
+        if index == 0:
+            used_ids.clear()
+        base = heading = _slugify(token['text'])
+        count = 1
+        while heading in used_ids:
+            heading = f'{base}_{count}'
+            count += 1
+        used_ids.add(heading)
+        return heading
+    
+    md = mistune.create_markdown(
+        escape=False,
+        hard_wrap=True,
+        renderer=HighlightRenderer(escape=False),
+        plugins=_MARKDOWN_PLUGINS
+    )
+    add_toc_hook(md, max_level=6, heading_id=heading_id)
+    return md
+
+
+class MarkdownConverter:
+    """Handles conversion of Obsidian markdown to HTML."""
+    
+    def __init__(self):
+        """Initialize the markdown converter; parsers are built on first use."""
+        self._md = None
+        self._md_lite_instance = None
+        
+        # Separate instance for callout bodies so their state never leaks
+        # into the host document
+        self._callout_md_instance = None
+    
+    @property
+    def md(self):
+        """Markdown parser for whole documents."""
+        if self._md is None:
+            self._md = _create_markdown()
+        return self._md
+    
+    @property
+    def _md_lite(self):
+        """Markdown parser for documents without code blocks or headings."""
+        if self._md_lite_instance is None:
+            self._md_lite_instance = _create_markdown(full=False)
+        return self._md_lite_instance
+    
+    @property
+    def _callout_md(self):
+        """Markdown parser for callout bodies."""
+        if self._callout_md_instance is None:
+            self._callout_md_instance = _create_markdown()
+        return self._callout_md_instance
+    
+    def convert_obsidian_to_html(self, content: str) -> str:
+        """
+        Convert Obsidian markdown content to HTML.
+        
+        Args:
+            content: Raw markdown content from Obsidian
+            
+        Returns:
+            HTML string with Obsidian features processed
+        """
+        # Process Obsidian-specific features first
+        processed_content = self._process_obsidian_content(content)
+        
+        # Skip highlighting and heading ids when there is nothing for them to do
+        if _RE_NEEDS_FULL_MARKDOWN.search(processed_content):
+            md = self.md
+        else:
+            md = self._md_lite
+        
+        # Convert to HTML
+        return md(processed_content)
+    
+    def _process_obsidian_content(self, content: str) -> str:
+        """
+        Process Obsidian-specific markdown features.
+        
+        Args:
+            content: Raw markdown content
+            
+        Returns:
+            Processed markdown content with Obsidian features converted
+        """
+        # Strip frontmatter, links and tags in one pass over the content
+        content = self._preprocess_obsidian(content)
+        
+        # Process callouts, only if a callout sigil is present at all
+        if '[!' in content:
+            content = self._process_callouts(content)
+        
+        return content
+    
+    def _preprocess_obsidian(self, content: str) -> str:
+        """
+        Remove frontmatter and convert internal links, markdown links and
+        tags to plaintext in a single pass.
+        
+        Args:
+            content: Raw markdown content
+            
+        Returns:
+            Content with frontmatter removed and links/tags as plaintext
+        """
+        # Remove frontmatter (YAML metadata at the top)
+        match = _RE_FRONTMATTER.match(content)
+        start = match.end() if match else 0
+        
+        out = []
+        self._scan_inline(content, start, len(content), out)
+        return ''.join(out)
+    
+    def _scan_inline(self, content: str, pos: int, end: int, out: list) -> None:
+        """
+        Scan content[pos:end] for links and tags, appending plaintext to out.
+        
+        Plain text between tokens is emitted as slices; link text is scanned
+        recursively so tags inside links are stripped as well.
+        
+        Args:
+            content: Markdown content being scanned
+            pos: Start index of the region to scan
+            end: End index (exclusive) of the region to scan
+            out: Output buffer of string slices
+        """
+        last = pos
+        contiguous = False
+        next_link = content.find('[', pos, end)
+        next_tag = content.find('#', pos, end)
+        
+        while next_link != -1 or next_tag != -1:
+            if next_tag == -1 or (next_link != -1 and next_link < next_tag):
+                i = next_link
+                
+                # [[link]] / [[link|display text]] -> link / display text
+                match = None
+                if content.startswith('[[', i):
+                    match = _RE_WIKILINK.match(content, i, end)
+                if match:
+                    text_group = 2 if match.group(2) else 1
+                else:
+                    # [text](url) -> text
+                    match = _RE_MDLINK.match(content, i, end)
+                    text_group = 1
+                
+                if match:
+                    _emit(out, content[last:i], contiguous)
+                    contiguous = False
+                    self._scan_inline(content, match.start(text_group), match.end(text_group), out)
+                    last = pos = match.end()
+                else:
+                    pos = i + 1
+            else:
+                i = next_tag
+                
+                # #tag -> tag, unless the '#' follows a word character
+                if i > last:
+                    prev = content[i - 1]
+                else:
+                    prev = out[-1][-1] if out else ''
+                if (i + 1 < end and _is_word_char(content[i + 1])
+                        and not _is_word_char(prev)):
+                    _emit(out, content[last:i], contiguous)
+                    contiguous = True
+                    last = i + 1
+                pos = i + 1
+            
+            if next_link != -1 and next_link < pos:
+                next_link = content.find('[', pos, end)
+            if next_tag != -1 and next_tag < pos:
+                next_tag = content.find('#', pos, end)
+        
+        _emit(out, content[last:end], contiguous)
+    
+    def _process_callouts(self, content: str) -> str:
+        """
+        Process Obsidian callouts and convert them to HTML.
+        
+        Args:
+            content: Markdown content with callouts
+            
+        Returns:
+            Content with callouts converted to HTML
+        """
+        def replace_callout(match):
+            callout_type = match.group(1).lower()
+            title = match.group(2).strip()
+            content_lines = match.group(3).strip().split('\n')
+            
+            # Remove the '> ' prefix from each line
+            content_text = '\n'.join([line[2:] if line.startswith('> ') else line for line in content_lines])
+            
+            # Convert the content to HTML, using the dedicated callout
+            # converter only when the body is more than simple inline text
+            content_html = _render_simple_callout_body(content_text)
+            if content_html is None:
+                content_html = self._callout_md(content_text)
+            
+            # The callout is embedded as a raw HTML block, which ends at the
+            # first blank line; keep blank lines (e.g. in code) from ending it
+            content_html = _RE_BLANK_LINE_BREAK.sub('&#10;', content_html)
+            
+            # Create callout HTML structure
+            callout_html = f'<div class="callout callout-{callout_type}">'
+            if title:
+                callout_html += f'<div class="callout-title">{title}</div>'
+            callout_html += f'<div class="callout-content">{content_html}</div>'
+            callout_html += '</div>\n\n'
+            
+            return callout_html
+        
+        return _RE_CALLOUT.sub(replace_callout, content)
+    
+    def create_html_document(self, html_content: str, title: str = "") -> str:
+        """
+        Wrap HTML content in a complete HTML document.
+        
+        Args:
+            html_content: The main HTML content
+            title: Page title (optional)
+            
+        Returns:
+            Complete HTML document
+        """
+        return ''.join(self.create_html_document_parts(html_content, title))
+    
+    def create_html_document_parts(self, html_content: str, title: str = "") -> List[str]:
+        """
+        Split a complete HTML document into the pieces it is built from.
+        
+        Lets callers write the document without joining it first.
+        
+        Args:
+            html_content: The main HTML content
+            title: Page title (optional)
+            
+        Returns:
+            Strings that concatenate to the complete HTML document
+        """
+        if not title:
+            title = "Document"
+        
+        return [_HTML_HEAD_PRE, html.escape(title), _HTML_HEAD_POST, html_content, _HTML_TAIL]
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_converter() -> MarkdownConverter:
+    """
+    Return the converter shared by convert_markdown_to_html.
+    
+    The converter keeps per-document state (e.g. heading ids) while
+    converting, so the shared instance must not be used from several
+    threads at once.
+    """
+    return MarkdownConverter()
+
+
+def convert_markdown_to_html(content: str, title: Optional[str] = None) -> str:
+    """
+    Convenience function to convert markdown to HTML.
+    
+    Reuses a single module-wide MarkdownConverter; not thread-safe.
+    
+    Args:
+        content: Raw markdown content
+        title: Optional page title
+        
+    Returns:
+        Complete HTML document
+    """
+    converter = _shared_converter()
+    html_content = converter.convert_obsidian_to_html(content)
+    return converter.create_html_document(html_content, title or "Document") 
\ No newline at end of file